@@ -11,6 +11,11 @@ def list_audio_devices():
     print("=" * 80)
 
     input_devices = []
+    try:
+        default_idx = p.get_default_input_device_info()['index']
+    except IOError:
+        # No default input device available
+        default_idx = None
 
     for i in range(p.get_device_count()):
         info = p.get_device_info_by_index(i)
@@ -22,7 +27,7 @@ def list_audio_devices():
             print(f"  Name: {info['name']}")
             print(f"  Input Channels: {info['maxInputChannels']}")
             print(f"  Default Sample Rate: {int(info['defaultSampleRate'])} Hz")
-            if i == p.get_default_input_device_info()['index']:
+            if i == default_idx:
                 print("  *** DEFAULT INPUT DEVICE ***")
 
     print("\n" + "=" * 80)
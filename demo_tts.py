@@ -5,6 +5,8 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add src to path for running demo
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -13,65 +15,84 @@ from voice_modals import PiperTTSEngine, VisemeMapper
 
 def print_phoneme_timeline(result):
     """Print phoneme/viseme timeline in a readable format."""
-    print("\n" + "=" * 80)
-    print("Phoneme/Viseme Timeline")
-    print("=" * 80)
-    print(f"Text: {result.text}")
-    print(f"Duration: {result.duration:.2f}s")
-    print(f"Sample Rate: {result.sample_rate}Hz")
-    print("-" * 80)
-    print(f"{'Time':>12} {'Phoneme':>10} {'Viseme':>10} {'Description'}")
-    print("-" * 80)
+    lines = [
+        "",
+        "=" * 80,
+        "Phoneme/Viseme Timeline",
+        "=" * 80,
+        f"Text: {result.text}",
+        f"Duration: {result.duration:.2f}s",
+        f"Sample Rate: {result.sample_rate}Hz",
+        "-" * 80,
+        f"{'Time':>12} {'Phoneme':>10} {'Viseme':>10} {'Description'}",
+        "-" * 80,
+    ]
+
+    # Look up each distinct viseme's description once
+    descriptions = {
+        viseme: VisemeMapper.get_viseme_description(viseme)
+        for viseme in {event.viseme for event in result.phonemes}
+    }
 
     for event in result.phonemes:
         time_str = f"{event.start:.2f}-{event.end:.2f}s"
-        desc = VisemeMapper.get_viseme_description(event.viseme)
-        print(f"{time_str:>12} {event.phoneme:>10} {event.viseme:>10} {desc}")
+        desc = descriptions[event.viseme]
+        lines.append(f"{time_str:>12} {event.phoneme:>10} {event.viseme:>10} {desc}")
 
-    print("=" * 80)
+    lines.append("=" * 80)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def visualize_timeline(result, width=80):
     """Create a simple ASCII visualization of the timeline."""
-    print("\n" + "=" * width)
-    print("Timeline Visualization")
-    print("=" * width)
+    sys.stdout.write(f"\n{'=' * width}\nTimeline Visualization\n{'=' * width}\n")
 
-    # Group consecutive same visemes
-    groups = []
-    current_viseme = None
-    current_start = 0
+    phonemes = result.phonemes
+    visemes = [event.viseme for event in phonemes]
 
-    for event in result.phonemes:
-        if event.viseme != current_viseme:
-            if current_viseme is not None:
-                groups.append((current_viseme, current_start, event.start))
-            current_viseme = event.viseme
-            current_start = event.start
+    # Group consecutive same visemes via run-length encoding on viseme IDs
+    viseme_ids = {}
+    ids = np.fromiter(
+        (viseme_ids.setdefault(v, len(viseme_ids)) for v in visemes),
+        dtype=np.intp,
+        count=len(visemes),
+    )
+    starts = np.fromiter((event.start for event in phonemes), dtype=np.float64, count=len(phonemes))
 
-    # Add final group
-    if current_viseme is not None:
-        groups.append((current_viseme, current_start, result.duration))
+    group_idx = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    if len(phonemes):
+        group_idx = np.concatenate(([0], group_idx))
+    group_starts = starts[group_idx]
+    group_ends = np.append(group_starts[1:], result.duration)[: len(group_idx)]
 
     # Create timeline
-    timeline = [" "] * width
+    start_pos = (group_starts / result.duration * width).astype(int)
+    end_pos = np.minimum((group_ends / result.duration * width).astype(int), width)
+    timeline = np.full(width, ord(" "), dtype=np.uint8)
     labels = []
 
-    for viseme, start, end in groups:
-        start_pos = int((start / result.duration) * width)
-        end_pos = int((end / result.duration) * width)
+    for idx, start, s_pos, e_pos in zip(group_idx, group_starts, start_pos, end_pos):
+        viseme = visemes[idx]
 
         # Fill with viseme character
-        for i in range(start_pos, min(end_pos, width)):
-            timeline[i] = viseme[0] if viseme else " "
+        timeline[s_pos:e_pos] = ord(viseme[0]) if viseme else ord(" ")
 
         # Store label
         labels.append(f"{viseme}({start:.1f}s)")
 
-    print("".join(timeline))
-    print("-" * width)
-    print("Visemes: " + ", ".join(labels))
-    print("=" * width)
+    sys.stdout.write(
+        "\n".join(
+            [
+                timeline.tobytes().decode("ascii"),
+                "-" * width,
+                "Visemes: " + ", ".join(labels),
+                "=" * width,
+            ]
+        )
+        + "\n"
+    )
+    sys.stdout.flush()
 
 
 def main():
@@ -82,16 +103,20 @@ def main():
         epilog="""
 Examples:
   # Basic usage
-  uv run python demo_tts.py "Hello, world!"
+  uv run python demo_tts.py "Hello, world!" --model en_US-lessac-medium.onnx
 
   # Save to file
-  uv run python demo_tts.py "Hello, world!" -o output.wav
+  uv run python demo_tts.py "Hello, world!" --model en_US-lessac-medium.onnx -o output.wav
 
   # Japanese text
-  uv run python demo_tts.py "こんにちは、世界" --language ja
+  uv run python demo_tts.py "こんにちは、世界" --model ja_model.onnx --language ja
 
   # Use simplified visemes
-  uv run python demo_tts.py "Hello" --simplified
+  uv run python demo_tts.py "Hello" --model en_US-lessac-medium.onnx --simplified
+
+  # Stream sentence by sentence
+  uv run python demo_tts.py "Hello. How are you?" --model en_US-lessac-medium.onnx \\
+      --stream -o output.wav
 
   # Show available voices
   uv run python demo_tts.py --list-voices
@@ -105,7 +130,7 @@ Examples:
     )
 
     parser.add_argument(
-        "--model", type=str, help="Path to Piper model file (.onnx)"
+        "--model", type=str, help="Path to Piper model file (.onnx, required for synthesis)"
     )
 
     parser.add_argument(
@@ -125,6 +150,12 @@ Examples:
         help="Use simplified viseme set (fewer visemes)",
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Synthesize sentence by sentence, reporting each chunk as it is ready",
+    )
+
     parser.add_argument(
         "--no-visualization",
         action="store_true",
@@ -142,8 +173,8 @@ Examples:
         print("Available Piper voices:")
         voices = PiperTTSEngine.list_available_voices()
         if voices:
-            for voice in voices:
-                print(f"  - {voice}")
+            sys.stdout.write("".join(f"  - {voice}\n" for voice in voices))
+            sys.stdout.flush()
         else:
             print("  No voices found or Piper not installed")
         return
@@ -151,6 +182,8 @@ Examples:
     # Check text
     if not args.text:
         parser.error("Text is required (unless using --list-voices)")
+    if not args.model:
+        parser.error("--model is required (path to a Piper .onnx voice model)")
 
     print("=" * 80)
     print("Piper TTS Demo - Phoneme/Viseme Output")
@@ -171,7 +204,23 @@ Examples:
     # Synthesize
     print("Synthesizing speech...")
     try:
-        if args.output:
+        if args.stream and args.output:
+            result = engine.synthesize_to_file_streaming(
+                args.text, args.output, include_json=True
+            )
+            print(f"\nSaved audio to: {args.output}")
+            print(f"Saved phoneme data to: {Path(args.output).with_suffix('.json')}")
+        elif args.stream:
+            chunks = []
+            for chunk in engine.synthesize_stream(args.text):
+                chunks.append(chunk)
+                print(
+                    f"  Chunk {len(chunks)} ready "
+                    f"({chunk.duration:.2f}s, {len(chunk.phonemes)} phonemes)"
+                )
+            result = engine.merge_chunks(args.text, chunks)
+            print("\nSynthesis complete (audio not saved)")
+        elif args.output:
             result = engine.synthesize_to_file(
                 args.text, args.output, include_json=True
             )
@@ -202,9 +251,8 @@ Examples:
         print("\nTroubleshooting:")
         print("1. Make sure Piper TTS is installed:")
         print("   pip install piper-tts")
-        print("2. Or download from: https://github.com/rhasspy/piper")
-        print("3. Check if piper is in your PATH:")
-        print("   piper --version")
+        print("2. Make sure the voice config (.onnx.json) is next to the model file")
+        print("3. Download voices from: https://github.com/rhasspy/piper/blob/master/VOICES.md")
         sys.exit(1)
 
 
@@ -20,7 +20,7 @@ def main():
     # Initialize ASR engine
     asr = StreamingASR(
         model_size="base",  # Use base model for good balance
-        device="cpu",  # Change to "cuda" if you have GPU
+        device="auto",  # Uses CUDA when available, otherwise CPU
         language="ja",  # Set to None for auto-detection
     )
 
@@ -51,7 +51,7 @@ def main():
 
         # Main loop: feed audio to ASR engine
         while True:
-            audio_chunk = audio.get_audio_chunk(timeout=1.0)
+            audio_chunk = audio.get_audio_batch(timeout=1.0)
             if audio_chunk is not None:
                 asr.add_audio(audio_chunk)
 
@@ -1,6 +1,7 @@
 """Example with custom callback that saves transcriptions to file."""
 
 import sys
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
@@ -29,6 +30,11 @@ class TranscriptionLogger:
             f.write(f"Transcription Log - Started at {datetime.now()}\n")
             f.write("=" * 80 + "\n\n")
 
+        # Keep a line-buffered handle open for appending transcriptions
+        self._fh = open(self.output_file, "a", encoding="utf-8", buffering=1)
+        # The ASR thread may still deliver a final result while close() runs
+        self._lock = threading.Lock()
+
     def on_transcription(self, result):
         """
         Handle transcription result.
@@ -36,18 +42,28 @@ class TranscriptionLogger:
         Args:
             result: TranscriptionResult object
         """
-        self.transcription_count += 1
-        timestamp = datetime.fromtimestamp(result.timestamp).strftime("%H:%M:%S")
+        with self._lock:
+            # Ignore results that arrive after the log was closed
+            if self._fh.closed:
+                return
+
+            self.transcription_count += 1
+            timestamp = datetime.fromtimestamp(result.timestamp).strftime("%H:%M:%S")
+
+            # Print to console
+            print(f"\n[{self.transcription_count}] [{timestamp}] [{result.language}]")
+            print(f"{result.text}")
+            print("-" * 80)
 
-        # Print to console
-        print(f"\n[{self.transcription_count}] [{timestamp}] [{result.language}]")
-        print(f"{result.text}")
-        print("-" * 80)
+            # Save to file
+            self._fh.write(f"[{self.transcription_count}] [{timestamp}] [{result.language}]\n")
+            self._fh.write(f"{result.text}\n\n")
 
-        # Save to file
-        with open(self.output_file, "a", encoding="utf-8") as f:
-            f.write(f"[{self.transcription_count}] [{timestamp}] [{result.language}]\n")
-            f.write(f"{result.text}\n\n")
+    def close(self):
+        """Flush and close the log file."""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
 
 
 def main():
@@ -67,7 +83,7 @@ def main():
     # Initialize ASR engine
     asr = StreamingASR(
         model_size="base",
-        device="cpu",
+        device="auto",
         language=None,  # Auto-detect language
     )
 
@@ -88,7 +104,7 @@ def main():
         asr.start_processing_thread(process_interval=3.0)
 
         while True:
-            audio_chunk = audio.get_audio_chunk(timeout=1.0)
+            audio_chunk = audio.get_audio_batch(timeout=1.0)
             if audio_chunk is not None:
                 asr.add_audio(audio_chunk)
 
@@ -97,6 +113,7 @@ def main():
     finally:
         asr.stop_processing_thread()
         audio.stop()
+        logger.close()
         print(f"\nTotal transcriptions: {logger.transcription_count}")
         print(f"Saved to: {output_file}")
         print("Done!")
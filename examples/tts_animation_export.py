@@ -1,14 +1,38 @@
 """Example: Export TTS phonemes for animation software (Unity, Unreal, etc.)."""
 
-import json
 import sys
 from pathlib import Path
 
+import numpy as np
+import orjson
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from voice_modals import PiperTTSEngine, VisemeMapper
 
+# Piper voice model (.onnx with its .onnx.json config alongside)
+# Download from: https://github.com/rhasspy/piper/blob/master/VOICES.md
+MODEL_PATH = "en_US-lessac-medium.onnx"
+
+
+def write_json(data: dict, output_file: str):
+    """Write data as indented JSON using orjson."""
+    Path(output_file).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def to_frames(result, fps: int):
+    """
+    Convert phoneme start/end times to frame numbers in one vectorized pass.
+
+    Returns:
+        Tuple of (start frames, end frames) as lists of ints
+    """
+    count = len(result.phonemes)
+    starts = np.fromiter((e.start for e in result.phonemes), dtype=np.float64, count=count)
+    ends = np.fromiter((e.end for e in result.phonemes), dtype=np.float64, count=count)
+    return (starts * fps).astype(np.int32).tolist(), (ends * fps).astype(np.int32).tolist()
+
 
 def export_for_unity(result, output_file: str):
     """
@@ -16,32 +40,28 @@ def export_for_unity(result, output_file: str):
 
     Unity typically uses OVR Lip Sync or similar systems.
     """
+    # Convert to frame-based timeline
+    fps = 30  # Assume 30fps animation
+    start_frames, end_frames = to_frames(result, fps)
+
     unity_data = {
         "version": "1.0",
         "text": result.text,
         "duration": result.duration,
-        "frameRate": 30,  # Assume 30fps animation
-        "visemeFrames": [],
-    }
-
-    # Convert to frame-based timeline
-    fps = 30
-    for event in result.phonemes:
-        start_frame = int(event.start * fps)
-        end_frame = int(event.end * fps)
-
-        unity_data["visemeFrames"].append(
+        "frameRate": fps,
+        "visemeFrames": [
             {
                 "startFrame": start_frame,
                 "endFrame": end_frame,
                 "viseme": event.viseme,
                 "phoneme": event.phoneme,
             }
-        )
+            for start_frame, end_frame, event in zip(start_frames, end_frames, result.phonemes)
+        ],
+    }
 
     # Save
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(unity_data, f, indent=2)
+    write_json(unity_data, output_file)
 
     print(f"✓ Exported Unity-compatible data to: {output_file}")
 
@@ -52,21 +72,16 @@ def export_for_blender(result, output_file: str):
 
     Blender uses shape keys for facial animation.
     """
+    # Convert visemes to shape key influences
+    fps = 24  # Blender default
+    start_frames, end_frames = to_frames(result, fps)
+
     blender_data = {
         "text": result.text,
         "duration": result.duration,
-        "fps": 24,  # Blender default
-        "shapeKeys": [],
-    }
-
-    # Convert visemes to shape key influences
-    fps = 24
-    for event in result.phonemes:
-        start_frame = int(event.start * fps)
-        end_frame = int(event.end * fps)
-
+        "fps": fps,
         # Each viseme corresponds to a shape key
-        blender_data["shapeKeys"].append(
+        "shapeKeys": [
             {
                 "frame_start": start_frame,
                 "frame_end": end_frame,
@@ -74,11 +89,12 @@ def export_for_blender(result, output_file: str):
                 "influence": 1.0,
                 "phoneme": event.phoneme,
             }
-        )
+            for start_frame, end_frame, event in zip(start_frames, end_frames, result.phonemes)
+        ],
+    }
 
     # Save
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(blender_data, f, indent=2)
+    write_json(blender_data, output_file)
 
     print(f"✓ Exported Blender-compatible data to: {output_file}")
 
@@ -89,45 +105,38 @@ def export_subtitles(result, output_file: str):
 
     Useful for video editing.
     """
-    srt_content = []
+    subtitles = []
 
-    # Group phonemes into words (simplified)
+    # Group phonemes into subtitle entries (simplified)
     # In real implementation, you'd need word boundaries
-    subtitle_index = 1
-    current_text = ""
     start_time = 0
+    last = len(result.phonemes) - 1
 
     for i, event in enumerate(result.phonemes):
-        current_text += event.phoneme
-
         # Create subtitle every 2 seconds or at end
-        if event.end - start_time > 2.0 or i == len(result.phonemes) - 1:
-            # Format timestamps for SRT (HH:MM:SS,mmm)
-            start_srt = format_srt_time(start_time)
-            end_srt = format_srt_time(event.end)
-
-            srt_content.append(f"{subtitle_index}")
-            srt_content.append(f"{start_srt} --> {end_srt}")
-            srt_content.append(result.text)  # Original text
-            srt_content.append("")  # Blank line
-
-            subtitle_index += 1
+        if event.end - start_time > 2.0 or i == last:
+            subtitles.append((start_time, event.end))
             start_time = event.end
-            current_text = ""
+
+    # Format timestamps for SRT (HH:MM:SS,mmm) and use the original text
+    srt = "\n".join(
+        f"{index}\n{format_srt_time(start)} --> {format_srt_time(end)}\n{result.text}\n"
+        for index, (start, end) in enumerate(subtitles, start=1)
+    )
 
     # Save
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(srt_content))
+    Path(output_file).write_text(srt, encoding="utf-8")
 
     print(f"✓ Exported SRT subtitles to: {output_file}")
 
 
 def format_srt_time(seconds: float) -> str:
     """Format seconds as SRT timestamp (HH:MM:SS,mmm)."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    # Work in integer milliseconds to avoid floating-point drift on long audio
+    millis = int(seconds * 1000 + 0.5)
+    secs, millis = divmod(millis, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
@@ -139,14 +148,15 @@ def main():
 
     # Initialize TTS
     print("\nInitializing Piper TTS...")
-    engine = PiperTTSEngine(language="en-us", use_simplified_visemes=True)
+    engine = PiperTTSEngine(model_path=MODEL_PATH, language="en-us", use_simplified_visemes=True)
 
     # Synthesize speech
     text = "Welcome to the animation export demo. This text will be converted to lip sync data."
     print(f"\nText: {text}\n")
 
+    # Synthesize once; all exports below are derived from the in-memory result
     print("Synthesizing speech...")
-    result = engine.synthesize_to_file(text, "animation_demo.wav")
+    result = engine.synthesize(text, output_file="animation_demo.wav")
 
     print(f"\n✓ Audio saved to: animation_demo.wav")
     print(f"Duration: {result.duration:.2f}s")
@@ -8,6 +8,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from voice_modals import PiperTTSEngine
 
+# Piper voice model (.onnx with its .onnx.json config alongside)
+# Download from: https://github.com/rhasspy/piper/blob/master/VOICES.md
+MODEL_PATH = "en_US-lessac-medium.onnx"
+
 
 def main():
     """Basic TTS example."""
@@ -18,6 +22,7 @@ def main():
     # Initialize TTS engine
     print("\nInitializing Piper TTS engine...")
     engine = PiperTTSEngine(
+        model_path=MODEL_PATH,
         language="en-us",
         use_simplified_visemes=True,  # Use simplified viseme set
     )
@@ -1,11 +1,27 @@
 """Voice Modals - Local Streaming ASR and TTS System."""
 
+from typing import TYPE_CHECKING
+
 __version__ = "0.2.0"
 
-from .audio_capture import AudioCapture
-from .streaming_asr import StreamingASR
-from .tts_engine import PiperTTSEngine, TTSResult, PhonemeEvent
-from .viseme_mapper import VisemeMapper
+if TYPE_CHECKING:
+    from .audio_capture import AudioCapture
+    from .streaming_asr import StreamingASR
+    from .tts_engine import PiperTTSEngine, TTSResult, PhonemeEvent, CacheStats
+    from .viseme_mapper import VisemeMapper
+
+# Public names mapped to the submodule that defines them. Submodules are
+# imported on first attribute access (PEP 562) so ASR-only users don't pay
+# for Piper/ONNX Runtime and TTS-only users don't pay for Whisper/PyAudio.
+_LAZY_IMPORTS = {
+    "AudioCapture": ".audio_capture",
+    "StreamingASR": ".streaming_asr",
+    "PiperTTSEngine": ".tts_engine",
+    "TTSResult": ".tts_engine",
+    "PhonemeEvent": ".tts_engine",
+    "CacheStats": ".tts_engine",
+    "VisemeMapper": ".viseme_mapper",
+}
 
 __all__ = [
     "AudioCapture",
@@ -13,5 +29,25 @@ __all__ = [
     "PiperTTSEngine",
     "TTSResult",
     "PhonemeEvent",
+    "CacheStats",
     "VisemeMapper",
 ]
+
+
+def __getattr__(name: str):
+    """Lazily import public names from their submodules."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names in dir()."""
+    return sorted(set(globals()) | set(__all__))
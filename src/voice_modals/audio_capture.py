@@ -1,11 +1,14 @@
 """Real-time audio capture module using PyAudio."""
 
-import queue
 import threading
+import time
 from typing import Optional, Callable
 import pyaudio
 import numpy as np
 
+# Scale factor to normalize int16 PCM samples to float32 [-1.0, 1.0]
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
 
 class AudioCapture:
     """Captures audio from microphone in real-time and provides it as chunks."""
@@ -15,7 +18,8 @@ class AudioCapture:
         sample_rate: int = 16000,
         chunk_duration: float = 1.0,
         channels: int = 1,
-        format: int = pyaudio.paInt16,
+        format: int = pyaudio.paFloat32,
+        buffer_slots: int = 16,
     ):
         """
         Initialize the audio capture.
@@ -24,7 +28,10 @@ class AudioCapture:
             sample_rate: Audio sample rate in Hz (Whisper uses 16kHz)
             chunk_duration: Duration of each audio chunk in seconds
             channels: Number of audio channels (1 for mono)
-            format: PyAudio format (paInt16 for 16-bit audio)
+            format: PyAudio format. paFloat32 (default) delivers samples Whisper can
+                use directly; falls back to paInt16 if the device rejects float input.
+            buffer_slots: Number of preallocated chunks in the ring buffer.
+                When the consumer falls this far behind, the oldest chunks are dropped.
         """
         self.sample_rate = sample_rate
         self.chunk_duration = chunk_duration
@@ -32,9 +39,23 @@ class AudioCapture:
         self.format = format
         self.chunk_size = int(sample_rate * chunk_duration)
 
+        # Ring buffer of preallocated float32 chunks. The callback thread only
+        # advances the write cursor and the consumer only advances the read
+        # cursor, so no lock is needed on the realtime path.
+        self._slots = buffer_slots
+        self._ring = [
+            np.empty(self.chunk_size * channels, dtype=np.float32) for _ in range(buffer_slots)
+        ]
+        self._lengths = [0] * buffer_slots
+        self._w = 0
+        self._r = 0
+        self._ready = threading.Event()
+        # Serializes consumers (get_audio_chunk vs. clear_queue); never taken
+        # by the callback thread
+        self._read_lock = threading.Lock()
+
         self.audio = pyaudio.PyAudio()
         self.stream: Optional[pyaudio.Stream] = None
-        self.audio_queue: queue.Queue = queue.Queue()
         self.is_recording = False
         self._thread: Optional[threading.Thread] = None
 
@@ -43,7 +64,22 @@ class AudioCapture:
         if self.is_recording:
             return
 
-        self.stream = self.audio.open(
+        try:
+            self.stream = self._open_stream()
+        except OSError:
+            if self.format != pyaudio.paFloat32:
+                raise
+            print("Device does not support float32 input, falling back to int16")
+            self.format = pyaudio.paInt16
+            self.stream = self._open_stream()
+
+        self.is_recording = True
+        self.stream.start_stream()
+        print(f"Audio capture started (sample_rate={self.sample_rate}Hz)")
+
+    def _open_stream(self) -> pyaudio.Stream:
+        """Open the PyAudio input stream in the configured format."""
+        return self.audio.open(
             format=self.format,
             channels=self.channels,
             rate=self.sample_rate,
@@ -52,10 +88,6 @@ class AudioCapture:
             stream_callback=self._audio_callback,
         )
 
-        self.is_recording = True
-        self.stream.start_stream()
-        print(f"Audio capture started (sample_rate={self.sample_rate}Hz)")
-
     def stop(self):
         """Stop capturing audio."""
         if not self.is_recording:
@@ -75,17 +107,34 @@ class AudioCapture:
         if status:
             print(f"Audio callback status: {status}")
 
-        # Convert bytes to numpy array
-        audio_data = np.frombuffer(in_data, dtype=np.int16)
-        # Normalize to float32 [-1.0, 1.0] as expected by Whisper
-        audio_data = audio_data.astype(np.float32) / 32768.0
-
-        self.audio_queue.put(audio_data)
+        idx = self._w % self._slots
+        slot = self._ring[idx]
+
+        if self.format == pyaudio.paFloat32:
+            # PortAudio already delivers float32 [-1.0, 1.0] as expected by Whisper
+            samples = np.frombuffer(in_data, dtype=np.float32)
+            n = len(samples)
+            slot[:n] = samples
+        else:
+            # Convert int16 bytes and normalize to float32 [-1.0, 1.0] in a
+            # single pass into the slot. Full-size buffers (the common case)
+            # skip creating an extra slice view.
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            n = len(samples)
+            np.multiply(samples, _INT16_SCALE, out=slot if n == len(slot) else slot[:n])
+
+        self._lengths[idx] = n
+
+        self._w += 1
+        self._ready.set()
         return (in_data, pyaudio.paContinue)
 
     def get_audio_chunk(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
         """
-        Get the next audio chunk from the queue.
+        Get the next audio chunk from the ring buffer.
+
+        If the consumer has fallen more than ``buffer_slots`` chunks behind,
+        the oldest chunks are dropped.
 
         Args:
             timeout: Maximum time to wait for audio chunk in seconds
@@ -93,18 +142,78 @@ class AudioCapture:
         Returns:
             Audio data as numpy array, or None if timeout
         """
-        try:
-            return self.audio_queue.get(timeout=timeout)
-        except queue.Empty:
+        return self.get_audio_batch(timeout=timeout, max_chunks=1)
+
+    def get_audio_batch(
+        self, timeout: Optional[float] = None, max_chunks: int = 8
+    ) -> Optional[np.ndarray]:
+        """
+        Get all pending audio chunks (up to max_chunks) as one array.
+
+        Blocks for the first chunk only; further chunks are drained without
+        waiting, so a consumer that fell behind catches up in one call.
+
+        Args:
+            timeout: Maximum time to wait for the first audio chunk in seconds
+            max_chunks: Maximum number of chunks to coalesce
+
+        Returns:
+            Concatenated audio data as numpy array, or None if timeout
+        """
+        if not self._wait_for_audio(timeout):
             return None
 
-    def clear_queue(self):
-        """Clear all pending audio chunks from the queue."""
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
+        with self._read_lock:
+            # Snapshot the write cursor once; the callback keeps advancing it
+            w = self._w
+
+            # The buffer may have been cleared while waiting
+            if self._r >= w:
+                return None
+
+            # Drop oldest chunks on overrun, keeping the slot being written untouched
+            if w - self._r >= self._slots:
+                self._r = w - self._slots + 1
+
+            count = min(w - self._r, max_chunks)
+            views = []
+            for r in range(self._r, self._r + count):
+                idx = r % self._slots
+                views.append(self._ring[idx][: self._lengths[idx]])
+            self._r += count
+
+            # Copy straight out of the ring slots, once, into the returned array
+            return views[0].copy() if count == 1 else np.concatenate(views)
+
+    def _wait_for_audio(self, timeout: Optional[float]) -> bool:
+        """
+        Wait until at least one chunk is pending.
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            True if a chunk is pending, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._r >= self._w:
+            # Clear before re-checking so a concurrent set() is never lost
+            self._ready.clear()
+            if self._r < self._w:
                 break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._ready.wait(remaining)
+
+        return True
+
+    def clear_queue(self):
+        """Clear all pending audio chunks from the ring buffer."""
+        with self._read_lock:
+            self._ready.clear()
+            self._r = self._w
 
     def __enter__(self):
         """Context manager entry."""
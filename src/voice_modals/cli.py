@@ -14,7 +14,7 @@ class StreamingASRApp:
     def __init__(
         self,
         model_size: str = "base",
-        device: str = "cpu",
+        device: str = "auto",
         language: Optional[str] = None,
         chunk_duration: float = 1.0,
         process_interval: float = 2.0,
@@ -24,7 +24,7 @@ class StreamingASRApp:
 
         Args:
             model_size: Whisper model size
-            device: Device to run on
+            device: Device to run on ("auto" uses CUDA when available)
             language: Language code (None for auto-detection)
             chunk_duration: Audio chunk duration in seconds
             process_interval: Processing interval in seconds
@@ -91,7 +91,7 @@ class StreamingASRApp:
 
             # Main loop: feed audio to ASR engine
             while self.running:
-                audio_chunk = self.audio_capture.get_audio_chunk(timeout=1.0)
+                audio_chunk = self.audio_capture.get_audio_batch(timeout=1.0)
                 if audio_chunk is not None:
                     self.asr_engine.add_audio(audio_chunk)
 
@@ -123,7 +123,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Use default settings (base model, CPU)
+  # Use default settings (base model, GPU if available)
   uv run python -m voice_modals.cli
 
   # Use small model with Japanese
@@ -148,9 +148,9 @@ Examples:
     parser.add_argument(
         "--device",
         type=str,
-        default="cpu",
+        default="auto",
         choices=["cpu", "cuda", "auto"],
-        help="Device to run on (default: cpu)",
+        help="Device to run on (default: auto)",
     )
 
     parser.add_argument(
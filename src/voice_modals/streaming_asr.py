@@ -1,13 +1,45 @@
 """Streaming ASR engine using Faster-Whisper for real-time transcription."""
 
+import asyncio
+import os
 import threading
 import time
-from typing import Optional, Callable, List
+from functools import lru_cache
+from typing import Optional, Callable
 from dataclasses import dataclass
+import ctranslate2
 import numpy as np
 from faster_whisper import WhisperModel
 
 
+@lru_cache(maxsize=4)
+def _load_whisper_model(
+    model_size: str, device: str, compute_type: str, cpu_threads: int
+) -> WhisperModel:
+    """
+    Load a Whisper model, shared process-wide per configuration.
+
+    Args:
+        model_size: Whisper model size
+        device: Resolved device ("cpu" or "cuda")
+        compute_type: CTranslate2 compute type
+        cpu_threads: Number of CPU threads for inference
+
+    Returns:
+        Loaded WhisperModel
+    """
+    print(f"Loading Whisper model: {model_size} on {device} ({compute_type})...")
+    model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+    )
+    print("Model loaded successfully")
+    return model
+
+
 @dataclass
 class TranscriptionResult:
     """Result of a transcription."""
@@ -24,44 +56,92 @@ class StreamingASR:
     def __init__(
         self,
         model_size: str = "base",
-        device: str = "cpu",
-        compute_type: str = "int8",
+        device: str = "auto",
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
         language: Optional[str] = None,
-        beam_size: int = 5,
+        beam_size: int = 1,
         vad_filter: bool = True,
         min_silence_duration: float = 0.5,
+        buffer_duration: float = 30.0,
+        silence_threshold: float = 0.005,
     ):
         """
         Initialize the streaming ASR engine.
 
         Args:
             model_size: Whisper model size (tiny, base, small, medium, large)
-            device: Device to run on ("cpu", "cuda", or "auto")
-            compute_type: Computation type for faster-whisper ("int8", "float16", etc.)
+            device: Device to run on ("cpu", "cuda", or "auto" to use CUDA when available)
+            compute_type: Computation type for faster-whisper ("int8", "float16", etc.).
+                None picks int8_float16 on CUDA (float16 if unsupported) and int8 on CPU.
+            cpu_threads: Number of CPU threads for inference (None uses all cores)
             language: Language code (None for auto-detection)
-            beam_size: Beam size for decoding
+            beam_size: Beam size for decoding. 1 (greedy) decodes several times fewer
+                tokens than beam search at a small accuracy cost; raise it for offline use.
             vad_filter: Enable Voice Activity Detection filter
             min_silence_duration: Minimum silence duration to split utterances
+            buffer_duration: Capacity of the audio ring buffer in seconds. Audio
+                arriving while the buffer is full is dropped.
+            silence_threshold: RMS level below which a chunk is treated as silence
+                and skipped without running the model when vad_filter is enabled
+                (0 disables the check).
         """
-        print(f"Loading Whisper model: {model_size} on {device}...")
-        self.model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type,
-        )
-        print("Model loaded successfully")
+        if device == "auto":
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        self.device = device
+
+        if compute_type is None:
+            compute_type = self._default_compute_type(device)
+        self.compute_type = compute_type
+
+        if cpu_threads is None:
+            cpu_threads = os.cpu_count() or 0
+
+        # Instances with the same configuration share one loaded model
+        self.model = _load_whisper_model(model_size, device, compute_type, cpu_threads)
 
         self.language = language
         self.beam_size = beam_size
         self.vad_filter = vad_filter
         self.min_silence_duration = min_silence_duration
+        self.silence_threshold = silence_threshold
 
         self.sample_rate = 16000  # Whisper expects 16kHz audio
         self.is_running = False
-        self._buffer: List[np.ndarray] = []
+        # Preallocated ring buffer. Samples in [_read_idx, _write_idx) are
+        # pending; indices count total samples and are mapped modulo capacity.
+        self._ring = np.empty(int(self.sample_rate * buffer_duration), dtype=np.float32)
+        self._write_idx = 0
+        self._read_idx = 0
+        # End of the region already handed to a transcription in progress
+        self._claim_idx = 0
         self._buffer_lock = threading.Lock()
+        # Serializes consumers so a pending region is transcribed only once
+        self._consume_lock = threading.Lock()
         self._callback: Optional[Callable[[TranscriptionResult], None]] = None
 
+        # Set by add_audio once enough unprocessed audio is buffered
+        self._data_ready = threading.Event()
+        self._ready_samples = self.sample_rate
+
+    @staticmethod
+    def _default_compute_type(device: str) -> str:
+        """
+        Pick the fastest low-precision compute type for the device.
+
+        Args:
+            device: Resolved device ("cpu" or "cuda")
+
+        Returns:
+            CTranslate2 compute type
+        """
+        if device != "cuda":
+            return "int8"
+
+        # INT8 weights with FP16 activations use tensor cores on Turing and later
+        supported = ctranslate2.get_supported_compute_types("cuda")
+        return "int8_float16" if "int8_float16" in supported else "float16"
+
     def transcribe_chunk(
         self, audio_data: np.ndarray, language: Optional[str] = None
     ) -> Optional[TranscriptionResult]:
@@ -83,16 +163,26 @@ class StreamingASR:
         if len(audio_data) < min_samples:
             return None
 
+        # Cheap energy gate so silent chunks skip VAD and the encoder entirely
+        if self.vad_filter and self.silence_threshold > 0:
+            energy = np.dot(audio_data, audio_data) / len(audio_data)
+            if energy < self.silence_threshold * self.silence_threshold:
+                return None
+
         try:
-            segments, info = self.model.transcribe(
-                audio_data,
+            options = dict(
                 language=language or self.language,
                 beam_size=self.beam_size,
+                # Streaming chunks are independent and callers only use the text,
+                # so skip timestamp tokens and previous-text conditioning
+                without_timestamps=True,
+                condition_on_previous_text=False,
                 vad_filter=self.vad_filter,
                 vad_parameters={
                     "min_silence_duration_ms": int(self.min_silence_duration * 1000)
                 },
             )
+            segments, info = self.model.transcribe(audio_data, **options)
 
             # Combine all segments
             text_parts = []
@@ -124,8 +214,28 @@ class StreamingASR:
         Args:
             audio_data: Audio data as numpy array (float32, 16kHz)
         """
+        size = len(self._ring)
+
         with self._buffer_lock:
-            self._buffer.append(audio_data)
+            free = size - (self._write_idx - self._read_idx)
+            if len(audio_data) > free:
+                print(f"Warning: ASR buffer full, dropping {len(audio_data) - free} samples")
+                audio_data = audio_data[:free]
+
+            # Copy into the free region, wrapping around the end of the ring.
+            # The consumer never touches this region, so it is safe to fill
+            # while a transcription of the pending region is in progress.
+            n = len(audio_data)
+            start = self._write_idx % size
+            first = min(n, size - start)
+            self._ring[start : start + first] = audio_data[:first]
+            if first < n:
+                self._ring[: n - first] = audio_data[first:]
+
+            self._write_idx += n
+
+            if self._write_idx - self._claim_idx >= self._ready_samples:
+                self._data_ready.set()
 
     def process_buffer(self) -> Optional[TranscriptionResult]:
         """
@@ -134,15 +244,51 @@ class StreamingASR:
         Returns:
             TranscriptionResult or None
         """
-        with self._buffer_lock:
-            if not self._buffer:
+        with self._consume_lock:
+            with self._buffer_lock:
+                read_idx, write_idx = self._read_idx, self._write_idx
+                self._claim_idx = write_idx
+
+            if read_idx == write_idx:
                 return None
 
-            # Concatenate all buffered audio
-            audio_data = np.concatenate(self._buffer)
-            self._buffer.clear()
+            try:
+                return self.transcribe_chunk(self._pending_audio(read_idx, write_idx))
+            finally:
+                # Release the region only after transcription so the producer
+                # cannot overwrite samples that are still being read
+                with self._buffer_lock:
+                    self._read_idx = write_idx
+
+    async def process_buffer_async(self) -> Optional[TranscriptionResult]:
+        """
+        Process the accumulated audio buffer without blocking the event loop.
 
-        return self.transcribe_chunk(audio_data)
+        Transcription runs in a worker thread, so coroutines feeding add_audio
+        keep running while Whisper decodes.
+
+        Returns:
+            TranscriptionResult or None
+        """
+        return await asyncio.to_thread(self.process_buffer)
+
+    def _pending_audio(self, read_idx: int, write_idx: int) -> np.ndarray:
+        """
+        Get pending samples from the ring buffer.
+
+        Args:
+            read_idx: Start of the pending region (total sample index)
+            write_idx: End of the pending region (total sample index)
+
+        Returns:
+            A view into the ring, or a copy only when the region wraps around
+        """
+        size = len(self._ring)
+        start = read_idx % size
+        end = start + (write_idx - read_idx)
+        if end <= size:
+            return self._ring[start:end]
+        return np.concatenate((self._ring[start:], self._ring[: end - size]))
 
     def set_callback(self, callback: Callable[[TranscriptionResult], None]):
         """
@@ -153,24 +299,37 @@ class StreamingASR:
         """
         self._callback = callback
 
-    def start_processing_thread(self, process_interval: float = 2.0):
+    def start_processing_thread(
+        self, process_interval: float = 2.0, min_audio_duration: Optional[float] = None
+    ):
         """
-        Start a background thread to periodically process the buffer.
+        Start a background thread that processes the buffer as audio arrives.
+
+        The thread wakes as soon as min_audio_duration of new audio is buffered,
+        and at least every process_interval to flush shorter remainders.
 
         Args:
-            process_interval: Time in seconds between processing attempts
+            process_interval: Maximum time in seconds between processing attempts
+            min_audio_duration: Amount of new audio in seconds that triggers processing
+                early (None uses process_interval, so each decode sees about that much audio)
         """
+        if min_audio_duration is None:
+            min_audio_duration = process_interval
+
         if self.is_running:
             return
 
         self.is_running = True
+        self._ready_samples = int(min_audio_duration * self.sample_rate)
+        self._data_ready.clear()
 
         def process_loop():
             while self.is_running:
+                self._data_ready.wait(timeout=process_interval)
+                self._data_ready.clear()
                 result = self.process_buffer()
                 if result and self._callback:
                     self._callback(result)
-                time.sleep(process_interval)
 
         self._thread = threading.Thread(target=process_loop, daemon=True)
         self._thread.start()
@@ -179,6 +338,8 @@ class StreamingASR:
     def stop_processing_thread(self):
         """Stop the background processing thread."""
         self.is_running = False
+        # Wake the processing thread so it exits without waiting for the timeout
+        self._data_ready.set()
         if hasattr(self, "_thread") and self._thread:
             self._thread.join(timeout=5.0)
         print("Stopped processing thread")
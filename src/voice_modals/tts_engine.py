@@ -1,21 +1,35 @@
 """Text-to-Speech engine using Piper TTS with phoneme/viseme support."""
 
+import io
 import json
+import os
 import subprocess
-import tempfile
 import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 import numpy as np
+import onnxruntime
+import orjson
+from piper.config import PiperConfig
+from piper.voice import PiperVoice
 
 from .viseme_mapper import VisemeMapper
 
+# Phonemes of one Piper sentence with the duration its audio last took
+_CachedSentence = Tuple[Tuple[str, ...], float]
+
 
 @dataclass
 class PhonemeEvent:
     """A phoneme event with timing information."""
 
+    # Long syntheses create thousands of events; slots drop the per-instance dict
+    __slots__ = ("start", "end", "phoneme", "viseme")
+
     start: float  # Start time in seconds
     end: float  # End time in seconds
     phoneme: str  # Phoneme string
@@ -26,6 +40,8 @@ class PhonemeEvent:
 class TTSResult:
     """Result of text-to-speech synthesis."""
 
+    __slots__ = ("audio", "sample_rate", "duration", "phonemes", "text")
+
     audio: np.ndarray  # Audio samples (float32, 16kHz or 22kHz)
     sample_rate: int  # Audio sample rate
     duration: float  # Total duration in seconds
@@ -33,6 +49,43 @@ class TTSResult:
     text: str  # Original text
 
 
+@dataclass
+class CacheStats:
+    """Hit/miss statistics of the phoneme cache."""
+
+    hits: int
+    misses: int
+    size: int  # Number of cached entries
+    maxsize: int  # Maximum number of cached entries
+
+
+@lru_cache(maxsize=4)
+def _load_piper_voice(model_path: str) -> Tuple[PiperVoice, dict]:
+    """
+    Load a Piper voice with an ONNX Runtime session tuned for CPU inference.
+
+    Voices are cached per model path, so engines created for the same model
+    share one session instead of reloading it.
+
+    Args:
+        model_path: Absolute path to Piper model file (.onnx)
+
+    Returns:
+        Tuple of (loaded PiperVoice, parsed voice config from .onnx.json)
+    """
+    with open(f"{model_path}.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = os.cpu_count() or 0
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    session = onnxruntime.InferenceSession(
+        model_path, sess_options=options, providers=["CPUExecutionProvider"]
+    )
+    return PiperVoice(session=session, config=PiperConfig.from_dict(config)), config
+
+
 class PiperTTSEngine:
     """Text-to-Speech engine using Piper with phoneme/viseme output."""
 
@@ -42,15 +95,19 @@ class PiperTTSEngine:
         language: str = "en-us",
         speaker: Optional[str] = None,
         use_simplified_visemes: bool = True,
+        cache_size: int = 64,
     ):
         """
         Initialize Piper TTS engine.
 
         Args:
-            model_path: Path to Piper model file (.onnx)
+            model_path: Path to Piper model file (.onnx). The voice config is read
+                from the accompanying .onnx.json file.
             language: Language code (e.g., 'en-us', 'ja')
             speaker: Speaker name/ID if multi-speaker model
             use_simplified_visemes: Use simplified viseme set
+            cache_size: Maximum number of texts whose phonemes are kept in the LRU cache
+                (0 disables caching)
         """
         self.model_path = model_path
         self.language = language
@@ -58,16 +115,46 @@ class PiperTTSEngine:
         self.use_simplified_visemes = use_simplified_visemes
         self.viseme_mapper = VisemeMapper()
 
-        # Check if piper is installed
-        try:
-            result = subprocess.run(
-                ["piper", "--version"], capture_output=True, text=True, check=True
+        # LRU cache of phonemized text. Only the small phoneme lists are kept,
+        # so hits skip G2P and re-run just the vocoder.
+        self._cache: "OrderedDict[tuple, Tuple[_CachedSentence, ...]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        if not model_path:
+            raise ValueError(
+                "model_path is required. Download a voice (.onnx and .onnx.json) from: "
+                "https://github.com/rhasspy/piper/blob/master/VOICES.md"
             )
-            print(f"Piper TTS version: {result.stdout.strip()}")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("Warning: Piper TTS not found in PATH")
-            print("Install with: pip install piper-tts")
-            print("Or download from: https://github.com/rhasspy/piper")
+
+        # Load the voice once per process and keep the ONNX Runtime session for all calls
+        self.voice, config = _load_piper_voice(str(Path(model_path).resolve()))
+        self.sample_rate = self.voice.config.sample_rate
+        self._speaker_id = self._resolve_speaker_id(config, speaker)
+        print(f"Loaded Piper voice: {model_path} ({self.sample_rate}Hz)")
+
+    @staticmethod
+    def _resolve_speaker_id(config: dict, speaker: Optional[str]) -> Optional[int]:
+        """
+        Resolve a speaker name or numeric ID to the model's speaker ID.
+
+        Args:
+            config: Parsed voice config (.onnx.json)
+            speaker: Speaker name/ID, or None for the default speaker
+
+        Returns:
+            Speaker ID, or None for single-speaker models
+        """
+        if speaker is None:
+            return None
+        if speaker.isdigit():
+            return int(speaker)
+
+        speaker_id_map = config.get("speaker_id_map", {})
+        if speaker not in speaker_id_map:
+            raise ValueError(f"Unknown speaker: {speaker}")
+        return speaker_id_map[speaker]
 
     def synthesize(
         self, text: str, output_file: Optional[str] = None
@@ -75,6 +162,9 @@ class PiperTTSEngine:
         """
         Synthesize speech from text with phoneme/viseme information.
 
+        Phonemes are cached per text and voice settings, so repeated text skips
+        phonemization and only runs the vocoder.
+
         Args:
             text: Input text to synthesize
             output_file: Optional output WAV file path
@@ -82,134 +172,234 @@ class PiperTTSEngine:
         Returns:
             TTSResult with audio and phoneme timeline
         """
-        # Create temporary files if needed
-        temp_audio = output_file or tempfile.mktemp(suffix=".wav")
-        temp_phonemes = tempfile.mktemp(suffix=".json")
+        cached = self._cache_get(text)
+        result = self.merge_chunks(text, list(self._synthesize_sentences(text, cached)))
 
-        try:
-            # Build piper command
-            cmd = ["piper"]
+        if output_file:
+            self._save_audio(result.audio, result.sample_rate, output_file)
 
-            if self.model_path:
-                cmd.extend(["--model", self.model_path])
+        return result
 
-            # Output phoneme JSON
-            cmd.extend(["--json-input", "--output_file", temp_audio])
+    def phonemes_only(self, text: str) -> List[PhonemeEvent]:
+        """
+        Get the phoneme/viseme timeline for text.
 
-            # Prepare input JSON
-            input_data = {"text": text}
-            if self.speaker:
-                input_data["speaker"] = self.speaker
+        On a cache hit the timeline is rebuilt from the cached phonemes and
+        durations without running the vocoder.
 
-            input_json = json.dumps(input_data)
+        Args:
+            text: Input text
 
-            # Run piper
-            result = subprocess.run(
-                cmd,
-                input=input_json,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+        Returns:
+            List of PhonemeEvent objects
+        """
+        cached = self._cache_get(text)
+        if cached is None:
+            return self.merge_chunks(text, list(self._synthesize_sentences(text))).phonemes
+
+        events: List[PhonemeEvent] = []
+        offset = 0.0
+        for phonemes, duration in cached:
+            events.extend(self._create_phoneme_events(list(phonemes), duration, offset))
+            offset += duration
 
-            # Parse phoneme output from stdout
-            phonemes = self._parse_piper_output(result.stdout)
+        return events or self._create_phoneme_events([], offset)
 
-            # Load audio
-            audio, sample_rate = self._load_audio(temp_audio)
+    def cache_stats(self) -> CacheStats:
+        """
+        Get phoneme cache statistics.
 
-            # Calculate duration
-            duration = len(audio) / sample_rate
+        Returns:
+            CacheStats with hit/miss counters
+        """
+        return CacheStats(
+            hits=self._cache_hits,
+            misses=self._cache_misses,
+            size=len(self._cache),
+            maxsize=self._cache_size,
+        )
+
+    def clear_cache(self):
+        """Clear the phoneme cache and reset its statistics."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _cache_get(self, text: str) -> Optional[Tuple[_CachedSentence, ...]]:
+        """
+        Look up cached phonemes for text and update hit/miss counters.
 
-            # Convert phonemes to visemes
-            phoneme_events = self._create_phoneme_events(phonemes, duration)
+        Args:
+            text: Input text
 
-            return TTSResult(
-                audio=audio,
-                sample_rate=sample_rate,
-                duration=duration,
-                phonemes=phoneme_events,
-                text=text,
-            )
+        Returns:
+            Cached (phonemes, duration) per sentence, or None on a miss
+        """
+        key = self._cache_key(text)
+        cached = self._cache.get(key)
+        if cached is None:
+            self._cache_misses += 1
+            return None
+
+        self._cache_hits += 1
+        self._cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, text: str, sentences: Tuple[_CachedSentence, ...]):
+        """
+        Store phonemes for text in the cache, evicting the least recently used.
+
+        Args:
+            text: Input text
+            sentences: (phonemes, duration) per sentence
+        """
+        if self._cache_size <= 0:
+            return
+
+        self._cache[self._cache_key(text)] = sentences
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_key(self, text: str) -> tuple:
+        """Build the cache key for text under the current voice settings."""
+        return (text, self.model_path, self.language, self.speaker, self.use_simplified_visemes)
+
+    def _synthesize_sentences(
+        self, text: str, cached: Optional[Tuple[_CachedSentence, ...]] = None
+    ) -> Iterator[TTSResult]:
+        """
+        Synthesize each sentence Piper finds in text as soon as it is ready.
+
+        Phonemes are stored in the cache once every sentence has been synthesized.
+
+        Args:
+            text: Input text
+            cached: Cached phonemes of text, used instead of phonemizing again
+
+        Yields:
+            TTSResult per sentence, with phoneme times relative to the start of text
+        """
+        offset = 0.0
+        sentences: List[_CachedSentence] = []
+
+        try:
+            if cached is None:
+                # Piper phonemizes text into one phoneme list per sentence
+                phoneme_lists = self.voice.phonemize(text)
+            else:
+                phoneme_lists = [list(phonemes) for phonemes, _ in cached]
+
+            for sentence_phonemes in phoneme_lists:
+                audio = self._synthesize_phonemes(sentence_phonemes)
+                duration = len(audio) / self.sample_rate
+
+                yield TTSResult(
+                    audio=audio,
+                    sample_rate=self.sample_rate,
+                    duration=duration,
+                    # Convert phonemes to visemes
+                    phonemes=self._create_phoneme_events(sentence_phonemes, duration, offset),
+                    text=text,
+                )
+                sentences.append((tuple(sentence_phonemes), duration))
+                offset += duration
 
-        except subprocess.CalledProcessError as e:
-            print(f"Piper TTS error: {e.stderr}")
-            raise
         except Exception as e:
             print(f"TTS synthesis error: {e}")
             raise
-        finally:
-            # Cleanup temp files
-            if not output_file and Path(temp_audio).exists():
-                Path(temp_audio).unlink()
-            if Path(temp_phonemes).exists():
-                Path(temp_phonemes).unlink()
 
-    def _parse_piper_output(self, output: str) -> List[dict]:
+        if cached is None:
+            self._cache_put(text, tuple(sentences))
+
+    def _synthesize_phonemes(self, phonemes: List[str]) -> np.ndarray:
         """
-        Parse Piper's phoneme output.
+        Run the Piper ONNX model on a phoneme sequence.
+
+        The session is run directly rather than through synthesize_ids_to_raw,
+        which quantizes to int16 PCM bytes that would only be converted back.
 
         Args:
-            output: Piper stdout containing phoneme info
+            phonemes: Phonemes of a single sentence
 
         Returns:
-            List of phoneme dictionaries
+            Audio samples (float32, [-1.0, 1.0])
         """
-        phonemes = []
-        try:
-            # Piper outputs JSON lines
-            for line in output.strip().split("\n"):
-                if line.strip():
-                    data = json.loads(line)
-                    if "phonemes" in data:
-                        phonemes.extend(data["phonemes"])
-        except json.JSONDecodeError as e:
-            print(f"Warning: Could not parse phoneme data: {e}")
+        config = self.voice.config
+        phoneme_ids = np.array([self.voice.phonemes_to_ids(phonemes)], dtype=np.int64)
+        inputs = {
+            "input": phoneme_ids,
+            "input_lengths": np.array([phoneme_ids.shape[1]], dtype=np.int64),
+            "scales": np.array(
+                [config.noise_scale, config.length_scale, config.noise_w], dtype=np.float32
+            ),
+            "sid": None,
+        }
+        if self._speaker_id is not None:
+            inputs["sid"] = np.array([self._speaker_id], dtype=np.int64)
+        elif config.num_speakers > 1:
+            inputs["sid"] = np.array([0], dtype=np.int64)
+
+        audio = self.voice.session.run(None, inputs)[0].reshape(-1)
+
+        # Peak-normalize like Piper does before its int16 conversion
+        peak = max(0.01, float(np.max(np.abs(audio))))
+        return np.multiply(audio, 1.0 / peak, dtype=np.float32)
+
+    def _save_audio(self, audio: np.ndarray, sample_rate: int, audio_file: str):
+        """
+        Save float32 audio to a 16-bit mono WAV file.
 
-        return phonemes
+        Args:
+            audio: Audio samples (float32, [-1.0, 1.0])
+            sample_rate: Audio sample rate
+            audio_file: Output WAV file path
+        """
+        Path(audio_file).write_bytes(self._encode_wav(audio, sample_rate))
 
-    def _load_audio(self, audio_file: str) -> Tuple[np.ndarray, int]:
+    def _encode_wav(self, audio: np.ndarray, sample_rate: int) -> bytes:
         """
-        Load audio from WAV file.
+        Encode float32 audio as 16-bit mono WAV bytes.
 
         Args:
-            audio_file: Path to WAV file
+            audio: Audio samples (float32, [-1.0, 1.0])
+            sample_rate: Audio sample rate
 
         Returns:
-            Tuple of (audio samples, sample rate)
+            WAV file contents
         """
-        with wave.open(audio_file, "rb") as wf:
-            sample_rate = wf.getframerate()
-            frames = wf.readframes(wf.getnframes())
-
-            # Convert to numpy array
-            audio = np.frombuffer(frames, dtype=np.int16)
-            # Normalize to float32 [-1.0, 1.0]
-            audio = audio.astype(np.float32) / 32768.0
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            wf.writeframes(self._to_pcm16(audio).tobytes())
+        return buffer.getvalue()
 
-            return audio, sample_rate
+    @staticmethod
+    def _to_pcm16(audio: np.ndarray) -> np.ndarray:
+        """Convert float32 audio in [-1.0, 1.0] to int16 PCM."""
+        return np.clip(audio * 32768.0, -32768, 32767).astype(np.int16)
 
     def _create_phoneme_events(
-        self, phonemes: List[dict], total_duration: float
+        self, phonemes: List[str], total_duration: float, offset: float = 0.0
     ) -> List[PhonemeEvent]:
         """
         Create phoneme events with timing and viseme mapping.
 
         Args:
-            phonemes: List of phoneme dictionaries from Piper
-            total_duration: Total audio duration
+            phonemes: List of phonemes from Piper
+            total_duration: Total audio duration of the phonemes
+            offset: Start time of the first phoneme in seconds
 
         Returns:
             List of PhonemeEvent objects
         """
-        events = []
-
         if not phonemes:
             # If no phonemes, create a single silence event
             return [
                 PhonemeEvent(
-                    start=0.0,
-                    end=total_duration,
+                    start=offset,
+                    end=offset + total_duration,
                     phoneme="sil",
                     viseme=self.viseme_mapper.phoneme_to_viseme(
                         "sil", self.use_simplified_visemes
@@ -217,25 +407,19 @@ class PiperTTSEngine:
                 )
             ]
 
-        # Calculate timing for each phoneme
-        for i, phoneme_data in enumerate(phonemes):
-            phoneme = phoneme_data.get("phoneme", "")
+        # Calculate timing for all phonemes at once
+        # Estimate timing (simple equal distribution for now)
+        # In real Piper output, these would come from the model
+        n = len(phonemes)
+        bounds = (offset + np.arange(n + 1) * (total_duration / n)).tolist()
 
-            # Estimate timing (simple equal distribution for now)
-            # In real Piper output, these would come from the model
-            start = (i / len(phonemes)) * total_duration
-            end = ((i + 1) / len(phonemes)) * total_duration
-
-            # Map to viseme
-            viseme = self.viseme_mapper.phoneme_to_viseme(
-                phoneme, self.use_simplified_visemes
-            )
-
-            events.append(
-                PhonemeEvent(start=start, end=end, phoneme=phoneme, viseme=viseme)
-            )
+        # Map all phonemes to visemes in one table-lookup pass
+        visemes = self.viseme_mapper.phonemes_to_visemes(phonemes, self.use_simplified_visemes)
 
-        return events
+        return [
+            PhonemeEvent(start=start, end=end, phoneme=phoneme, viseme=viseme)
+            for phoneme, viseme, start, end in zip(phonemes, visemes, bounds, bounds[1:])
+        ]
 
     def synthesize_to_file(
         self, text: str, output_file: str, include_json: bool = True
@@ -251,32 +435,152 @@ class PiperTTSEngine:
         Returns:
             TTSResult object
         """
-        result = self.synthesize(text, output_file)
+        if not include_json:
+            return self.synthesize(text, output_file)
+
+        # Prepare both files in memory, then write them concurrently
+        result = self.synthesize(text)
+        json_file = Path(output_file).with_suffix(".json")
+        wav_bytes = self._encode_wav(result.audio, result.sample_rate)
+        json_bytes = self._encode_phoneme_json(result)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(Path(output_file).write_bytes, wav_bytes),
+                executor.submit(json_file.write_bytes, json_bytes),
+            ]
+            for future in futures:
+                future.result()
+
+        print(f"Saved phoneme data to: {json_file}")
+
+        return result
+
+    def synthesize_stream(self, text: str) -> Iterator[TTSResult]:
+        """
+        Synthesize speech sentence by sentence, yielding each chunk as soon as it is ready.
+
+        Each sentence Piper finds in the text is synthesized and yielded
+        before the next one starts, so the first audio is available after one
+        sentence rather than the whole text. Phoneme timings of each chunk are
+        relative to the start of the whole utterance. Text found in the phoneme
+        cache skips phonemization.
+
+        Args:
+            text: Input text to synthesize
+
+        Yields:
+            TTSResult for each sentence, with text set to the whole input
+        """
+        yield from self._synthesize_sentences(text, self._cache_get(text))
+
+    def merge_chunks(self, text: str, chunks: List[TTSResult]) -> TTSResult:
+        """
+        Merge consecutive synthesis chunks into a single result.
+
+        Use this to assemble the chunks yielded by synthesize_stream().
+
+        Args:
+            text: Text of the whole utterance
+            chunks: Chunks in playback order, with phoneme times already offset
+
+        Returns:
+            TTSResult for the whole utterance
+        """
+        if chunks:
+            audio = np.concatenate([chunk.audio for chunk in chunks])
+        else:
+            audio = np.zeros(0, dtype=np.float32)
+        duration = len(audio) / self.sample_rate
+
+        phoneme_events = [event for chunk in chunks for event in chunk.phonemes]
+        if not phoneme_events:
+            phoneme_events = self._create_phoneme_events([], duration)
+
+        return TTSResult(
+            audio=audio,
+            sample_rate=self.sample_rate,
+            duration=duration,
+            phonemes=phoneme_events,
+            text=text,
+        )
+
+    def synthesize_to_file_streaming(
+        self, text: str, output_file: str, include_json: bool = True
+    ) -> TTSResult:
+        """
+        Synthesize speech and write it to file incrementally as chunks arrive.
+
+        Args:
+            text: Input text
+            output_file: Output WAV file path
+            include_json: Also save phoneme/viseme data as JSON
+
+        Returns:
+            TTSResult object for the whole utterance
+        """
+        chunks: List[TTSResult] = []
+
+        try:
+            with wave.open(output_file, "wb") as wf:
+                # Header is written with zero length and patched on close
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.sample_rate)
+                for chunk in self.synthesize_stream(text):
+                    wf.writeframesraw(self._to_pcm16(chunk.audio).tobytes())
+                    chunks.append(chunk)
+        except BaseException:
+            # Don't leave a truncated WAV behind
+            Path(output_file).unlink(missing_ok=True)
+            raise
+
+        result = self.merge_chunks(text, chunks)
 
-        # Save phoneme/viseme data as JSON
         if include_json:
-            json_file = Path(output_file).with_suffix(".json")
-            data = {
-                "text": result.text,
-                "duration": result.duration,
-                "sample_rate": result.sample_rate,
-                "phonemes": [
-                    {
-                        "start": p.start,
-                        "end": p.end,
-                        "phoneme": p.phoneme,
-                        "viseme": p.viseme,
-                    }
-                    for p in result.phonemes
-                ],
-            }
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            print(f"Saved phoneme data to: {json_file}")
+            self._save_phoneme_json(result, output_file)
 
         return result
 
+    def _save_phoneme_json(self, result: TTSResult, output_file: str):
+        """
+        Save phoneme/viseme data as JSON next to the WAV file.
+
+        Args:
+            result: TTSResult to serialize
+            output_file: WAV file path; the JSON uses the same name with .json suffix
+        """
+        json_file = Path(output_file).with_suffix(".json")
+        json_file.write_bytes(self._encode_phoneme_json(result))
+
+        print(f"Saved phoneme data to: {json_file}")
+
+    def _encode_phoneme_json(self, result: TTSResult) -> bytes:
+        """
+        Encode phoneme/viseme data as UTF-8 JSON.
+
+        Args:
+            result: TTSResult to serialize
+
+        Returns:
+            JSON file contents
+        """
+        data = {
+            "text": result.text,
+            "duration": result.duration,
+            "sample_rate": result.sample_rate,
+            "phonemes": [
+                {
+                    "start": p.start,
+                    "end": p.end,
+                    "phoneme": p.phoneme,
+                    "viseme": p.viseme,
+                }
+                for p in result.phonemes
+            ],
+        }
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
     @staticmethod
     def list_available_voices() -> List[str]:
         """
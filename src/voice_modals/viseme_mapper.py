@@ -1,6 +1,6 @@
 """Phoneme to Viseme mapping for lip-sync animation."""
 
-from typing import Dict
+from typing import Dict, Iterable, List, Tuple
 
 
 class VisemeMapper:
@@ -92,6 +92,51 @@ class VisemeMapper:
         "sil": "Sil", # Silence
     }
 
+    # Human-readable descriptions of the standard visemes
+    VISEME_DESCRIPTIONS: Dict[str, str] = {
+        "sil": "Silence (neutral mouth)",
+        "aa": "Open mouth (ah)",
+        "E": "Medium open mouth (eh)",
+        "I": "Smile (ee)",
+        "O": "Round lips (oh)",
+        "U": "Pucker lips (oo)",
+        "PP": "Lips pressed together (p, b, m)",
+        "FF": "Lower lip against upper teeth (f, v)",
+        "TH": "Tongue between/behind teeth (th, t, d)",
+        "SS": "Teeth together, hissing (s, z)",
+        "CH": "Lips forward, teeth close (sh, ch)",
+        "RR": "Lips slightly rounded (r)",
+        "kk": "Back of mouth (k, g)",
+        "nn": "Nasal (n, ng)",
+        "DD": "Default consonant",
+    }
+
+    # Phoneme -> simplified viseme, composed from the two maps above by
+    # rebuild_lookup_tables() so simplified lookups need a single dict access
+    PHONEME_TO_SIMPLIFIED: Dict[str, str] = {}
+    # Sorted viseme sets returned by get_all_visemes(), also filled by rebuild_lookup_tables()
+    _ALL_VISEMES: Tuple[str, ...] = ()
+    _ALL_SIMPLIFIED_VISEMES: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Rebuild lookup tables for subclasses with custom mappings."""
+        super().__init_subclass__(**kwargs)
+        cls.rebuild_lookup_tables()
+
+    @classmethod
+    def rebuild_lookup_tables(cls):
+        """
+        Recompute PHONEME_TO_SIMPLIFIED and the viseme sets from the current mappings.
+
+        Call this after modifying PHONEME_TO_VISEME or SIMPLIFIED_VISEME_MAP in place.
+        """
+        cls.PHONEME_TO_SIMPLIFIED = {
+            phoneme: cls.SIMPLIFIED_VISEME_MAP.get(viseme, "Sil")
+            for phoneme, viseme in cls.PHONEME_TO_VISEME.items()
+        }
+        cls._ALL_VISEMES = tuple(sorted(set(cls.PHONEME_TO_VISEME.values())))
+        cls._ALL_SIMPLIFIED_VISEMES = tuple(sorted(set(cls.SIMPLIFIED_VISEME_MAP.values())))
+
     @classmethod
     def phoneme_to_viseme(cls, phoneme: str, simplified: bool = False) -> str:
         """
@@ -104,14 +149,29 @@ class VisemeMapper:
         Returns:
             Viseme identifier string
         """
-        # Get base viseme
-        viseme = cls.PHONEME_TO_VISEME.get(phoneme, "sil")
+        if not simplified:
+            return cls.PHONEME_TO_VISEME.get(phoneme, "sil")
 
-        # Convert to simplified if requested
-        if simplified:
-            viseme = cls.SIMPLIFIED_VISEME_MAP.get(viseme, "Sil")
+        return cls.PHONEME_TO_SIMPLIFIED.get(phoneme, "Sil")
 
-        return viseme
+    @classmethod
+    def phonemes_to_visemes(cls, phonemes: Iterable[str], simplified: bool = False) -> List[str]:
+        """
+        Convert a sequence of phonemes to visemes in one pass.
+
+        Args:
+            phonemes: Phoneme strings (IPA or other notation)
+            simplified: Use simplified viseme set
+
+        Returns:
+            List of viseme identifiers, one per phoneme
+        """
+        if not simplified:
+            lookup = cls.PHONEME_TO_VISEME.get
+            return [lookup(phoneme, "sil") for phoneme in phonemes]
+
+        lookup = cls.PHONEME_TO_SIMPLIFIED.get
+        return [lookup(phoneme, "Sil") for phoneme in phonemes]
 
     @classmethod
     def get_viseme_description(cls, viseme: str) -> str:
@@ -124,24 +184,7 @@ class VisemeMapper:
         Returns:
             Description string
         """
-        descriptions = {
-            "sil": "Silence (neutral mouth)",
-            "aa": "Open mouth (ah)",
-            "E": "Medium open mouth (eh)",
-            "I": "Smile (ee)",
-            "O": "Round lips (oh)",
-            "U": "Pucker lips (oo)",
-            "PP": "Lips pressed together (p, b, m)",
-            "FF": "Lower lip against upper teeth (f, v)",
-            "TH": "Tongue between/behind teeth (th, t, d)",
-            "SS": "Teeth together, hissing (s, z)",
-            "CH": "Lips forward, teeth close (sh, ch)",
-            "RR": "Lips slightly rounded (r)",
-            "kk": "Back of mouth (k, g)",
-            "nn": "Nasal (n, ng)",
-            "DD": "Default consonant",
-        }
-        return descriptions.get(viseme, "Unknown viseme")
+        return cls.VISEME_DESCRIPTIONS.get(viseme, "Unknown viseme")
 
     @classmethod
     def get_all_visemes(cls, simplified: bool = False) -> list:
@@ -155,6 +198,9 @@ class VisemeMapper:
             List of viseme identifiers
         """
         if simplified:
-            return list(set(cls.SIMPLIFIED_VISEME_MAP.values()))
+            return list(cls._ALL_SIMPLIFIED_VISEMES)
         else:
-            return list(set(cls.PHONEME_TO_VISEME.values()))
+            return list(cls._ALL_VISEMES)
+
+
+VisemeMapper.rebuild_lookup_tables()
@@ -47,7 +47,7 @@ def test_system():
         # Run for 10 seconds
         start_time = time.time()
         while time.time() - start_time < 10:
-            audio_chunk = audio.get_audio_chunk(timeout=1.0)
+            audio_chunk = audio.get_audio_batch(timeout=1.0)
             if audio_chunk is not None:
                 asr.add_audio(audio_chunk)
 